@@ -157,3 +157,110 @@ CREATE SECURITY POLICY gold.customer_filter_policy
 ADD FILTER PREDICATE security.fn_security_predicate(customer_sk)
 ON gold.fact_sales
 WITH (STATE = ON, SCHEMABINDING = ON);
+
+-- ============================================================================
+-- 5. STAGING TABLES (COPY INTO targets for the Bronze Parquet files)
+-- ============================================================================
+
+-- One table per source table, with the Bronze file's snake_case columns in
+-- source order: integers load as BIGINT, DECIMAL as FLOAT (the pipeline reads
+-- decimals as float64), text as NVARCHAR. Heaps load fastest; the gold star
+-- schema is built from these tables.
+-- The three lineage columns are not in the Parquet files: COPY INTO leaves
+-- them NULL and the pipeline fills them for the loaded batch
+CREATE SCHEMA stg;
+GO
+
+CREATE TABLE stg.dim_customer (
+    customerid BIGINT,
+    customername NVARCHAR(100),
+    email NVARCHAR(255),
+    phone NVARCHAR(20),
+    address NVARCHAR(500),
+    city NVARCHAR(100),
+    state NVARCHAR(50),
+    country NVARCHAR(50),
+    postalcode NVARCHAR(20),
+    lastmodified DATETIME2,
+
+    -- Lineage (set by the pipeline after COPY INTO)
+    _source_system NVARCHAR(50),
+    _ingestion_timestamp DATETIME2,
+    _migration_batch_id VARCHAR(20)
+)
+WITH (DISTRIBUTION = ROUND_ROBIN, HEAP);
+
+CREATE TABLE stg.dim_product (
+    productid BIGINT,
+    productname NVARCHAR(200),
+    category NVARCHAR(100),
+    subcategory NVARCHAR(100),
+    brand NVARCHAR(100),
+    unitcost FLOAT,
+    unitprice FLOAT,
+    suppliername NVARCHAR(100),
+    lastmodified DATETIME2,
+
+    -- Lineage (set by the pipeline after COPY INTO)
+    _source_system NVARCHAR(50),
+    _ingestion_timestamp DATETIME2,
+    _migration_batch_id VARCHAR(20)
+)
+WITH (DISTRIBUTION = ROUND_ROBIN, HEAP);
+
+CREATE TABLE stg.dim_date (
+    datekey BIGINT,
+    fulldate DATE,
+    dayofweek BIGINT,
+    dayname NVARCHAR(10),
+    dayofmonth BIGINT,
+    dayofyear BIGINT,
+    weekofyear BIGINT,
+    monthnumber BIGINT,
+    monthname NVARCHAR(10),
+    quarter BIGINT,
+    yearnumber BIGINT,
+    fiscalquarter BIGINT,
+
+    -- Lineage (set by the pipeline after COPY INTO)
+    _source_system NVARCHAR(50),
+    _ingestion_timestamp DATETIME2,
+    _migration_batch_id VARCHAR(20)
+)
+WITH (DISTRIBUTION = ROUND_ROBIN, HEAP);
+
+CREATE TABLE stg.fact_sales (
+    salesid BIGINT,
+    salesordernumber NVARCHAR(50),
+    linenumber BIGINT,
+    customerid BIGINT,
+    productid BIGINT,
+    orderdate DATETIME2,
+    quantity BIGINT,
+    unitprice FLOAT,
+    unitcost FLOAT,
+    salesamount FLOAT,
+    lastmodified DATETIME2,
+
+    -- Lineage (set by the pipeline after COPY INTO)
+    _source_system NVARCHAR(50),
+    _ingestion_timestamp DATETIME2,
+    _migration_batch_id VARCHAR(20)
+)
+WITH (DISTRIBUTION = ROUND_ROBIN, HEAP);
+
+CREATE TABLE stg.fact_inventory (
+    inventoryid BIGINT,
+    productid BIGINT,
+    warehouseid BIGINT,
+    snapshotdate DATETIME2,
+    quantityonhand BIGINT,
+    unitcost FLOAT,
+    lastmodified DATETIME2,
+
+    -- Lineage (set by the pipeline after COPY INTO)
+    _source_system NVARCHAR(50),
+    _ingestion_timestamp DATETIME2,
+    _migration_batch_id VARCHAR(20)
+)
+WITH (DISTRIBUTION = ROUND_ROBIN, HEAP);
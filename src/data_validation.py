@@ -3,9 +3,10 @@ Data Validation Framework for Migration
 Ensures data integrity between on-prem and cloud
 """
 
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,43 +24,136 @@ class MigrationValidator:
         """Validate row counts match between source and target"""
         match = source_count == target_count
         if match:
-            logger.info(f"Row count validation PASSED: {source_count} rows")
+            logger.info("Row count validation PASSED: %d rows", source_count)
         else:
-            logger.error(f"Row count validation FAILED: Source={source_count}, Target={target_count}")
+            logger.error("Row count validation FAILED: Source=%d, Target=%d", source_count, target_count)
         return match
     
+    def validate_row_counts_bulk(self, src_conn, tgt_conn, tables: List[str],
+                                 target_tables: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[int, int, bool]]:
+        """
+        Validate row counts for many tables with one UNION ALL query per side
+        Two round trips in total instead of one COUNT(*) query per table
+        target_tables maps source table names to target names where they differ
+        Returns {table: (source_count, target_count, match)}, keyed by source name
+        """
+        if not tables:
+            return {}
+        target_tables = target_tables or {}
+        
+        def count_query(names: Dict[str, str]) -> str:
+            return "\nUNION ALL\n".join(
+                f"SELECT '{label}' AS tbl, COUNT_BIG(*) AS c FROM {name}" for label, name in names.items()
+            )
+        
+        source_query = count_query({table: table for table in tables})
+        target_query = count_query({table: target_tables.get(table, table) for table in tables})
+        
+        src_cursor = src_conn.cursor()
+        src_cursor.execute(source_query)
+        source_counts = {tbl: count for tbl, count in src_cursor.fetchall()}
+        
+        tgt_cursor = tgt_conn.cursor()
+        tgt_cursor.execute(target_query)
+        target_counts = {tbl: count for tbl, count in tgt_cursor.fetchall()}
+        
+        results = {}
+        for table in tables:
+            source_count, target_count = source_counts.get(table), target_counts.get(table)
+            match = source_count == target_count
+            if match:
+                logger.info("Row count validation PASSED for %s: %s rows", table, source_count)
+            else:
+                logger.error("Row count validation FAILED for %s: Source=%s, Target=%s", table, source_count, target_count)
+            results[table] = (source_count, target_count, match)
+        
+        return results
+    
     def validate_checksum(self, source_df: pd.DataFrame, target_df: pd.DataFrame, key_column: str) -> bool:
         """
         Compare checksums of key columns to ensure data fidelity
-        Uses hash of concatenated string values
+        Uses pandas' vectorized row hashing (hash_pandas_object)
         """
         try:
-            # Create checksum for source
-            source_df['checksum'] = source_df.apply(
-                lambda row: hash(tuple(row.values)), axis=1
-            )
-            source_checksum = source_df[key_column].astype(str) + '_' + source_df['checksum'].astype(str)
-            source_set = set(source_checksum)
+            # Vectorized per-row uint64 hashes (no axis=1 apply)
+            src_hash = pd.util.hash_pandas_object(source_df, index=False).values
+            tgt_hash = pd.util.hash_pandas_object(target_df, index=False).values
             
-            # Create checksum for target
-            target_df['checksum'] = target_df.apply(
-                lambda row: hash(tuple(row.values)), axis=1
-            )
-            target_checksum = target_df[key_column].astype(str) + '_' + target_df['checksum'].astype(str)
-            target_set = set(target_checksum)
+            src_keys = source_df[key_column].to_numpy()
+            tgt_keys = target_df[key_column].to_numpy()
             
-            # Compare
-            diff = source_set.symmetric_difference(target_set)
+            if src_keys.dtype.kind in 'iu' and tgt_keys.dtype.kind in 'iu':
+                # Integer keys: pack (key << 32) ^ low 32 hash bits into one uint64 per row
+                # and compare the arrays directly
+                low_bits = np.uint64(0xFFFFFFFF)
+                shift = np.uint64(32)
+                src_packed = (src_keys.astype(np.uint64) << shift) ^ (src_hash & low_bits)
+                tgt_packed = (tgt_keys.astype(np.uint64) << shift) ^ (tgt_hash & low_bits)
+                diff_count = int(np.setxor1d(src_packed, tgt_packed).size)
+            else:
+                src = pd.DataFrame({'k': src_keys, 'h': src_hash})
+                tgt = pd.DataFrame({'k': tgt_keys, 'h': tgt_hash})
+                
+                # Compare: outer merge on (key, hash), rows not in both sides are mismatches
+                merged = pd.merge(src, tgt, on=['k', 'h'], how='outer', indicator=True)
+                diff_count = int((merged['_merge'] != 'both').sum())
             
-            if len(diff) == 0:
+            if diff_count == 0:
                 logger.info("Checksum validation PASSED: Data fidelity confirmed")
                 return True
             else:
-                logger.warning(f"Checksum validation FAILED: {len(diff)} rows mismatch")
+                logger.warning("Checksum validation FAILED: %d rows mismatch", diff_count)
+                return False
+                
+        except Exception as e:
+            logger.error("Checksum calculation error: %s", e)
+            return False
+    
+    def validate_checksum_sql(self, src_conn, tgt_conn, table_name: str,
+                              value_columns: Dict[str, str],
+                              target_table: Optional[str] = None,
+                              target_columns: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Compare row count and aggregate row checksum computed inside the databases
+        value_columns maps each source column to the SQL type both sides are
+        CAST to before BINARY_CHECKSUM, e.g. {'UnitPrice': 'DECIMAL(18,2)'}.
+        The pipeline changes types on the way (DECIMAL -> FLOAT, text dates ->
+        DATETIME2), so uncast or whole-row (*) checksums never agree.
+        target_columns maps source column names to target names where they differ.
+        Only two scalars per side cross the wire, so tables too large to pull
+        into pandas can still be checked
+        """
+        if not value_columns:
+            raise ValueError("value_columns must name the columns to checksum and their common SQL type")
+        target_table = target_table or table_name
+        target_columns = target_columns or {}
+        
+        def checksum_expr(names: Dict[str, str]) -> str:
+            casts = ', '.join(f"CAST([{names.get(col, col)}] AS {sql_type})"
+                              for col, sql_type in value_columns.items())
+            return f"CHECKSUM_AGG(BINARY_CHECKSUM({casts}))"
+        
+        try:
+            src_cursor = src_conn.cursor()
+            src_cursor.execute(f"SELECT COUNT_BIG(*), {checksum_expr({})} FROM {table_name}")
+            source_count, source_checksum = src_cursor.fetchone()
+            
+            tgt_cursor = tgt_conn.cursor()
+            tgt_cursor.execute(f"SELECT COUNT_BIG(*), {checksum_expr(target_columns)} FROM {target_table}")
+            target_count, target_checksum = tgt_cursor.fetchone()
+            
+            if source_count == target_count and source_checksum == target_checksum:
+                logger.info("SQL checksum validation PASSED for %s: %s rows", table_name, source_count)
+                return True
+            else:
+                logger.warning(
+                    "SQL checksum validation FAILED for %s: Source=%s/%s, Target=%s/%s",
+                    table_name, source_count, source_checksum, target_count, target_checksum
+                )
                 return False
                 
         except Exception as e:
-            logger.error(f"Checksum calculation error: {e}")
+            logger.error("SQL checksum calculation error: %s", e)
             return False
     
     def validate_schema(self, source_schema: Dict, target_schema: Dict) -> bool:
@@ -70,7 +164,7 @@ class MigrationValidator:
         if source_cols != target_cols:
             missing_in_target = source_cols - target_cols
             extra_in_target = target_cols - source_cols
-            logger.error(f"Schema mismatch. Missing: {missing_in_target}, Extra: {extra_in_target}")
+            logger.error("Schema mismatch. Missing: %s, Extra: %s", missing_in_target, extra_in_target)
             return False
         
         logger.info("Schema validation PASSED")
@@ -78,29 +172,75 @@ class MigrationValidator:
     
     def validate_nulls(self, df: pd.DataFrame, critical_columns: list) -> bool:
         """Ensure no unexpected nulls in critical columns"""
-        null_check = df[critical_columns].isnull().sum()
-        issues = null_check[null_check > 0]
+        # Column at a time: no (rows x columns) boolean frame, and .any() short-circuits
+        issues = {}
+        for col in critical_columns:
+            arr = df[col].to_numpy()
+            if arr.dtype.kind in 'fc':
+                has_null = np.isnan(arr).any()
+            else:
+                has_null = pd.isna(arr).any()
+            if has_null:
+                issues[col] = int(pd.isna(arr).sum())
         
         if len(issues) > 0:
-            logger.warning(f"Null values found: {issues.to_dict()}")
+            logger.warning("Null values found: %s", issues)
             return False
         
         logger.info("Null validation PASSED")
         return True
     
+    def run_all(self, source_df: pd.DataFrame, target_df: pd.DataFrame, key_column: str,
+                critical_columns: list, fail_fast: bool = False) -> Dict:
+        """
+        Run every check cheapest-first: row count, schema, nulls, checksum
+        With fail_fast, stop at the first failure so the O(N) checksum is
+        skipped whenever a cheaper check has already failed
+        """
+        results = {
+            'source_rows': len(source_df),
+            'target_rows': len(target_df)
+        }
+        checks = [
+            ('row_count', lambda: self.validate_row_counts(len(source_df), len(target_df))),
+            ('schema', lambda: self.validate_schema(dict(source_df.dtypes), dict(target_df.dtypes))),
+            ('nulls', lambda: self.validate_nulls(target_df, critical_columns)),
+            ('checksum', lambda: self.validate_checksum(source_df, target_df, key_column)),
+        ]
+        
+        for name, check in checks:
+            results[name] = check()
+            if fail_fast and not results[name]:
+                logger.warning("Stopping validation after failed %s check", name)
+                break
+        
+        return results
+    
     def generate_validation_report(self, table_name: str, results: Dict) -> str:
-        """Generate HTML/Markdown report for stakeholders"""
+        """
+        Generate HTML/Markdown report for stakeholders
+        Checks missing from results (e.g. skipped by fail_fast) show as SKIPPED
+        """
+        checks = ['row_count', 'schema', 'checksum', 'nulls']
+        
+        def status(check: str) -> str:
+            if check not in results:
+                return '⏭️ SKIPPED'
+            return '✅ PASS' if results[check] else '❌ FAIL'
+        
+        approved = all(check in results and results[check] for check in checks)
+        
         report = f"""
 ## Migration Validation Report: {table_name}
 
 | Check | Status | Details |
 |-------|--------|---------|
-| Row Count | {'✅ PASS' if results['row_count'] else '❌ FAIL'} | Source: {results.get('source_rows', 'N/A')}, Target: {results.get('target_rows', 'N/A')} |
-| Schema | {'✅ PASS' if results['schema'] else '❌ FAIL'} | Column consistency check |
-| Data Integrity | {'✅ PASS' if results['checksum'] else '❌ FAIL'} | Checksum validation |
-| Null Check | {'✅ PASS' if results['nulls'] else '❌ FAIL'} | Critical columns |
+| Row Count | {status('row_count')} | Source: {results.get('source_rows', 'N/A')}, Target: {results.get('target_rows', 'N/A')} |
+| Schema | {status('schema')} | Column consistency check |
+| Data Integrity | {status('checksum')} | Checksum validation |
+| Null Check | {status('nulls')} | Critical columns |
 
-**Overall Status:** {'✅ APPROVED FOR PRODUCTION' if all(results.values()) else '⚠️ ISSUES DETECTED - REVIEW REQUIRED'}
+**Overall Status:** {'✅ APPROVED FOR PRODUCTION' if approved else '⚠️ ISSUES DETECTED - REVIEW REQUIRED'}
 
 Generated: {pd.Timestamp.now()}
         """
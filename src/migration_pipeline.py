@@ -4,13 +4,34 @@ Migrates data from on-prem SQL Server to Azure Synapse Analytics
 Implements incremental load with watermark pattern
 """
 
+import json
+import os
+import re
+import threading
 import pyodbc
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from azure.identity import DefaultAzureCredential
 from azure.storage.filedatalake import DataLakeServiceClient
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from decimal import Decimal
 import logging
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote_plus
+
+try:
+    import fcntl  # POSIX file locking for the watermark file
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+try:
+    import connectorx as cx  # Optional: Arrow-native extraction for full loads
+except ImportError:
+    cx = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,12 +45,40 @@ class CloudMigrationPipeline:
     Supports full load and incremental (CDC) patterns
     """
     
+    # Characters stripped from column names when converting to snake_case
+    _SNAKE_RE = re.compile(r'[^\w]')
+    # Arrow type for each Python type pyodbc reports in cursor.description
+    # (DECIMAL maps to float64 because pd.read_sql coerces decimals to float)
+    _ARROW_TYPES = {
+        str: pa.string(),
+        int: pa.int64(),
+        float: pa.float64(),
+        Decimal: pa.float64(),
+        bool: pa.bool_(),
+        datetime: pa.timestamp('us'),
+        date: pa.date32(),
+        time: pa.time64('us'),
+        bytes: pa.binary(),
+        bytearray: pa.binary()
+    }
+    
     def __init__(self):
-        self.watermark_file = "migration_watermark.txt"
+        self.watermark_file = "migration_watermark.json"
+        # Pre-JSON format (one "table=timestamp" line per run), imported if no JSON file exists yet
+        self.legacy_watermark_file = "migration_watermark.txt"
         self.batch_size = 100000  # Process 100k rows at a time
+        self._watermarks = self._load_watermarks()
+        # Tables migrate concurrently; guards _watermarks and the watermark file
+        self._watermark_lock = threading.Lock()
         
-    def connect_onprem_sql(self, server: str, database: str, username: str, password: str):
-        """Connect to source SQL Server (on-premise)"""
+    def connect_onprem_sql(self, server: str, database: str, username: str, password: str,
+                           char_encoding: Optional[str] = None):
+        """
+        Connect to source SQL Server (on-premise)
+        NVARCHAR is decoded as UTF-16LE (SQL Server's wide-character encoding).
+        VARCHAR keeps pyodbc's default unless char_encoding names the client
+        code page (e.g. 'cp1252', or 'utf-8' on a UTF-8 client)
+        """
         try:
             conn_str = (
                 f"DRIVER={{ODBC Driver 17 for SQL Server}};"
@@ -39,152 +88,555 @@ class CloudMigrationPipeline:
                 f"PWD={password}"
             )
             conn = pyodbc.connect(conn_str)
-            logger.info(f"Connected to source: {server}.{database}")
+            conn.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-16le')
+            if char_encoding:
+                conn.setdecoding(pyodbc.SQL_CHAR, encoding=char_encoding)
+            logger.info("Connected to source: %s.%s", server, database)
+            return conn
+        except Exception as e:
+            logger.error("Failed to connect to source: %s", e)
+            raise
+    
+    def connect_synapse(self, server: str, database: str):
+        """Connect to target Azure Synapse dedicated SQL pool (Managed Identity auth)"""
+        try:
+            conn_str = (
+                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+                f"SERVER={server};"
+                f"DATABASE={database};"
+                f"Authentication=ActiveDirectoryMsi"
+            )
+            conn = pyodbc.connect(conn_str)
+            logger.info("Connected to target: %s.%s", server, database)
             return conn
         except Exception as e:
-            logger.error(f"Failed to connect to source: {e}")
+            logger.error("Failed to connect to target: %s", e)
             raise
     
-    def get_watermark(self, table_name: str) -> datetime:
-        """Get last successful migration timestamp for incremental load"""
+    def _load_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the watermark file; lookups are served from this in-memory copy,
+        which update_watermark refreshes from disk on every write
+        """
         try:
             with open(self.watermark_file, 'r') as f:
-                watermarks = dict(line.strip().split('=') for line in f)
-                return datetime.fromisoformat(watermarks.get(table_name, '1900-01-01'))
+                return json.load(f)
         except FileNotFoundError:
-            return datetime(1900, 1, 1)
+            return self._load_legacy_watermarks()
+    
+    def _load_legacy_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Import watermarks from the old append-only text file so the switch to
+        JSON does not restart incremental loads from 1900
+        The file has one "table=timestamp" line per run; the last line wins.
+        The JSON file is written on the next update_watermark
+        """
+        watermarks = {}
+        try:
+            with open(self.legacy_watermark_file, 'r') as f:
+                for line in f:
+                    if '=' not in line:
+                        continue
+                    table_name, last_ts = line.strip().split('=', 1)
+                    watermarks[table_name] = {
+                        'last_ts': last_ts,
+                        'last_pk': None,
+                        'chunk_size': self.batch_size
+                    }
+        except FileNotFoundError:
+            return {}
+        
+        logger.info("Imported %d watermarks from %s", len(watermarks), self.legacy_watermark_file)
+        return watermarks
+    
+    def get_watermark(self, table_name: str) -> Dict[str, Any]:
+        """
+        Get last successful migration position for incremental load
+        Watermark file is JSON: {table: {last_ts, last_pk, chunk_size}}
+        """
+        with self._watermark_lock:
+            entry = dict(self._watermarks.get(table_name, {}))
+        return {
+            'last_ts': datetime.fromisoformat(entry.get('last_ts', '1900-01-01')),
+            'last_pk': entry.get('last_pk'),
+            'chunk_size': entry.get('chunk_size', self.batch_size)
+        }
     
-    def update_watermark(self, table_name: str, new_watermark: datetime):
-        """Update watermark after successful migration"""
+    @contextmanager
+    def _watermark_file_lock(self):
+        """
+        Exclusive OS lock on a sidecar lock file, held while the watermark file
+        is read, merged and replaced, so separate pipeline processes do not
+        overwrite each other's updates
+        """
+        with open(f"{self.watermark_file}.lock", 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def update_watermark(self, table_name: str, last_ts: datetime, last_pk: Any = None):
+        """
+        Update watermark (timestamp + key of the last migrated row) after successful migration
+        Under the file lock, the file is re-read and only this table's entry is
+        replaced, then it is rewritten atomically (temp file + os.replace).
+        The in-memory copy is refreshed only once the write has succeeded
+        """
         try:
-            with open(self.watermark_file, 'a+') as f:
-                f.write(f"{table_name}={new_watermark.isoformat()}\n")
-            logger.info(f"Updated watermark for {table_name}: {new_watermark}")
+            with self._watermark_lock, self._watermark_file_lock():
+                watermarks = self._load_watermarks()
+                entry = dict(watermarks.get(table_name, {'chunk_size': self.batch_size}))
+                entry['last_ts'] = last_ts.isoformat()
+                # numpy scalars are not JSON serializable
+                entry['last_pk'] = last_pk.item() if hasattr(last_pk, 'item') else last_pk
+                watermarks[table_name] = entry
+                
+                tmp_file = f"{self.watermark_file}.tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(watermarks, f, indent=2)
+                os.replace(tmp_file, self.watermark_file)
+                self._watermarks = watermarks
+            logger.info("Updated watermark for %s: %s (key %s)", table_name, last_ts, last_pk)
         except Exception as e:
-            logger.error(f"Failed to update watermark: {e}")
+            logger.error("Failed to update watermark for %s: %s", table_name, e)
+            raise
+    
+    def _projection(self, columns: Optional[List[str]]) -> str:
+        """SELECT list for the configured columns, or * when none are configured"""
+        return ', '.join(f"[{col}]" for col in columns) if columns else '*'
+    
+    def source_column_types(self, conn, table_name: str,
+                            columns: Optional[List[str]] = None) -> Dict[str, pa.DataType]:
+        """
+        Arrow types of the extracted columns, keyed by snake_case name
+        Read from the source's result-set metadata (SELECT TOP 0), so the
+        Bronze schema does not depend on whatever values the first batch holds
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT TOP 0 {self._projection(columns)} FROM {table_name}")
+        types = {}
+        for column in cursor.description:
+            arrow_type = self._ARROW_TYPES.get(column[1])
+            if arrow_type is not None:
+                types[self.snake_case(column[0])] = arrow_type
+        cursor.close()
+        return types
     
-    def extract_data(self, conn, table_name: str, incremental: bool = True) -> pd.DataFrame:
+    def extract_data(self, conn, table_name: str, incremental: bool = True,
+                     columns: Optional[List[str]] = None,
+                     pk_column: Optional[str] = None) -> Iterator[pd.DataFrame]:
         """
         Extract data from source with optional incremental logic
         Uses ROWVERSION (timestamp) for change data capture
+        Only the given columns are selected (projection pushed into SQL)
+        Yields DataFrames of at most batch_size rows so peak memory is O(batch)
+        
+        With a pk_column, incremental loads use DBLog-style chunked selects:
+        short keyset-paginated SELECT TOP queries ordered by (LastModified, pk)
+        instead of one long-running scan. The leading LastModified >= ? keeps
+        the predicate seekable on a (LastModified, pk) index. The projection
+        must then include LastModified and the pk column.
         """
-        if incremental:
+        projection = self._projection(columns)
+        if incremental and pk_column:
             watermark = self.get_watermark(table_name)
+            last_ts, last_pk = watermark['last_ts'], watermark['last_pk']
+            chunk_size = watermark['chunk_size']
             query = f"""
-            SELECT *
+            SELECT TOP {chunk_size} {projection}
+            FROM {table_name}
+            WHERE LastModified >= ? AND (LastModified > ? OR [{pk_column}] > ?)
+            ORDER BY LastModified, [{pk_column}]
+            """
+            logger.info("Chunked incremental load from %s since %s (key %s)", table_name, last_ts, last_pk)
+            while True:
+                chunk = pd.read_sql(query, conn, params=[last_ts, last_ts, last_pk])
+                if len(chunk) == 0:
+                    break
+                logger.info("Extracted %d rows from %s", len(chunk), table_name)
+                is_last_chunk = len(chunk) < chunk_size
+                # Read the next position before yielding: the consumer may
+                # rename or mutate the chunk in place (transform_for_synapse)
+                next_ts = pd.Timestamp(chunk['LastModified'].iloc[-1]).to_pydatetime()
+                next_pk = chunk[pk_column].iloc[-1]
+                # pyodbc cannot bind numpy scalars
+                next_pk = next_pk.item() if hasattr(next_pk, 'item') else next_pk
+                # A full chunk that ends where it started would be fetched again
+                # forever, e.g. when a datetime column (1/300 s precision) is
+                # compared with a datetime2 parameter and the tie never matches
+                if not is_last_chunk and (next_ts, next_pk) == (last_ts, last_pk):
+                    raise RuntimeError(
+                        f"Chunked extraction of {table_name} made no progress past "
+                        f"({last_ts}, {last_pk}); check the LastModified column type"
+                    )
+                last_ts, last_pk = next_ts, next_pk
+                yield chunk
+                if is_last_chunk:
+                    break
+            return
+        
+        if incremental:
+            watermark = self.get_watermark(table_name)['last_ts']
+            query = f"""
+            SELECT {projection}
             FROM {table_name}
             WHERE LastModified > ?
             ORDER BY LastModified
             """
-            logger.info(f"Incremental load from {table_name} since {watermark}")
-            df = pd.read_sql(query, conn, params=[watermark])
+            logger.info("Incremental load from %s since %s", table_name, watermark)
+            chunks = pd.read_sql(query, conn, params=[watermark], chunksize=self.batch_size)
         else:
-            logger.info(f"Full load from {table_name}")
-            query = f"SELECT * FROM {table_name}"
-            df = pd.read_sql(query, conn)
+            logger.info("Full load from %s", table_name)
+            query = f"SELECT {projection} FROM {table_name}"
+            chunks = pd.read_sql(query, conn, chunksize=self.batch_size)
         
-        logger.info(f"Extracted {len(df)} rows from {table_name}")
-        return df
+        for chunk in chunks:
+            logger.info("Extracted %d rows from %s", len(chunk), table_name)
+            yield chunk
+    
+    def extract_data_connectorx(self, source_config: dict, table_name: str,
+                                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Full-load extraction through connectorx
+        Rows are read straight into Arrow record batches instead of pyodbc row
+        objects and streamed (return_type='arrow_stream'), so at most one
+        batch_size batch is held in memory, as with extract_data
+        """
+        uri = (
+            f"mssql://{quote_plus(source_config['username'])}:{quote_plus(source_config['password'])}"
+            f"@{source_config['server']}/{source_config['database']}"
+        )
+        query = f"SELECT {self._projection(columns)} FROM {table_name}"
+        
+        logger.info("Full load from %s via connectorx", table_name)
+        reader = cx.read_sql(uri, query, return_type='arrow_stream', batch_size=self.batch_size)
+        
+        # Match pd.read_sql, which coerces DECIMAL columns to float
+        schema = pa.schema([
+            pa.field(f.name, pa.float64()) if pa.types.is_decimal(f.type) else f for f in reader.schema
+        ])
+        
+        for batch in reader:
+            logger.info("Extracted %d rows from %s", batch.num_rows, table_name)
+            yield pa.Table.from_batches([batch]).cast(schema).to_pandas()
+    
+    def snake_case(self, column: str) -> str:
+        """Convert a source column name to snake_case (Synapse best practice)"""
+        return self._SNAKE_RE.sub('', column.lower().replace(' ', '_'))
     
-    def transform_for_synapse(self, df: pd.DataFrame) -> pd.DataFrame:
+    def transform_for_synapse(self, df: pd.DataFrame, date_columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Clean and transform data for Azure Synapse
         - Standardize column names
         - Handle nulls
         - Optimize data types
+        date_columns (snake_case names, from the table's configuration) are
+        parsed as timestamps; every other text column is kept as-is.
+        A value that does not parse raises rather than being loaded as NULL
         """
         # Convert column names to snake_case (Synapse best practice)
-        df.columns = (
-            df.columns.str.lower()
-            .str.replace(' ', '_')
-            .str.replace(r'[^\w]', '', regex=True)
-        )
+        df.columns = [self.snake_case(c) for c in df.columns]
         
         # Optimize data types
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                # Check if it's actually a date
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='ignore')
-                except:
-                    pass
-        
-        # Add metadata columns
-        df['_ingestion_timestamp'] = datetime.utcnow()
-        df['_source_system'] = 'legacy_sql_server'
-        df['_migration_batch_id'] = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        for col in date_columns or []:
+            parsed = pd.to_datetime(df[col], format='ISO8601', errors='coerce')
+            unparsed = df[col][parsed.isna() & df[col].notna()]
+            if len(unparsed):
+                raise ValueError(
+                    f"{len(unparsed)} values in date column {col} are not ISO-8601 dates "
+                    f"(first: {unparsed.iloc[0]!r})"
+                )
+            df[col] = parsed
         
-        logger.info(f"Transformed data: {df.shape[0]} rows, {df.shape[1]} columns")
+        logger.info("Transformed data: %d rows, %d columns", df.shape[0], df.shape[1])
         return df
     
-    def load_to_adls(self, df: pd.DataFrame, table_name: str, layer: str = 'bronze'):
+    def adls_path(self, table_name: str, layer: str = 'bronze', batch_id: Optional[str] = None) -> str:
+        """
+        Build the Data Lake path for a table's Parquet file and ensure its local directory exists
+        The path's first segment is the layer's container; the file is written
+        locally first and pushed to ADLS Gen2 by upload_to_adls
+        The batch id is part of the file name, so a second run on the same
+        day adds a file instead of overwriting the earlier delta
+        """
+        file_name = f"{table_name}_{batch_id}" if batch_id else table_name
+        file_path = f"{layer}/{table_name}/{datetime.now().strftime('%Y/%m/%d')}/{file_name}.parquet"
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        return file_path
+    
+    def bronze_schema(self, df: pd.DataFrame, source_types: Dict[str, pa.DataType],
+                      date_columns: List[str]) -> pa.Schema:
+        """
+        Parquet schema for a table's Bronze file, fixed before the first write
+        Types come from the source metadata and the table's date columns; the
+        first (transformed) batch is only used for columns the source did not
+        describe, and columns that are all NULL there become strings
+        """
+        fields = []
+        for field in pa.Schema.from_pandas(df, preserve_index=False):
+            if field.name in date_columns:
+                arrow_type = pa.timestamp('us')
+            elif field.name in source_types:
+                arrow_type = source_types[field.name]
+            elif pa.types.is_null(field.type):
+                arrow_type = pa.string()
+            else:
+                arrow_type = field.type
+            fields.append(pa.field(field.name, arrow_type))
+        return pa.schema(fields)
+    
+    def ingestion_metadata(self) -> Dict[str, str]:
+        """
+        Ingestion metadata for one table load
+        Stored as Parquet file-level key-value metadata rather than as three
+        constant columns repeated on every row; load_to_synapse writes the
+        same values to the Synapse rows
+        """
+        ingested_at = datetime.utcnow()
+        return {
+            '_ingestion_timestamp': ingested_at.isoformat(),
+            '_source_system': 'legacy_sql_server',
+            '_migration_batch_id': ingested_at.strftime('%Y%m%d%H%M%S')
+        }
+    
+    def load_to_adls(self, df: pd.DataFrame, file_path: str,
+                     writer: Optional[pq.ParquetWriter] = None,
+                     file_metadata: Optional[Dict[str, str]] = None,
+                     schema: Optional[pa.Schema] = None) -> pq.ParquetWriter:
         """
-        Load data to Azure Data Lake (Bronze layer initially)
-        Parquet format for optimal performance
+        Load a batch to Azure Data Lake (Bronze layer initially)
+        Streams batches into a single Parquet file through one ParquetWriter;
+        the writer is opened on the first batch and must be closed by the caller
+        Every batch is cast to schema (see bronze_schema); without one, the
+        schema is inferred from the first batch
+        file_metadata is written to the file footer (read back via
+        pq.ParquetFile(path).schema_arrow.metadata)
         """
         try:
-            # In production, use Azure SDK to write to ADLS Gen2
-            # Simulating here with local file for demonstration
-            file_path = f"{layer}/{table_name}/{datetime.now().strftime('%Y/%m/%d')}/{table_name}.parquet"
+            if writer is None:
+                if schema is None:
+                    schema = pa.Schema.from_pandas(df, preserve_index=False)
+                if file_metadata:
+                    schema = schema.with_metadata({**(schema.metadata or {}), **file_metadata})
+                # Write as Parquet (compressed, columnar format), one row group per batch
+                writer = pq.ParquetWriter(
+                    file_path,
+                    schema,
+                    compression='snappy',
+                    use_dictionary=True,
+                    data_page_size=1 << 20
+                )
             
-            # Create directory if not exists
-            import os
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False, safe=False)
+            writer.write_table(table)
             
-            # Write as Parquet (compressed, columnar format)
-            df.to_parquet(file_path, index=False, compression='snappy')
+            logger.info("Loaded %d rows to %s", len(df), file_path)
+            return writer
             
-            logger.info(f"Loaded {len(df)} rows to {file_path}")
-            return file_path
+        except Exception as e:
+            logger.error("Failed to load data: %s", e)
+            raise
+    
+    def upload_to_adls(self, storage_url: str, file_path: str) -> str:
+        """
+        Upload a locally written layer file to ADLS Gen2 (Managed Identity auth)
+        Returns the file's URL for COPY INTO
+        """
+        try:
+            container, _, path = file_path.partition('/')
+            service = DataLakeServiceClient(account_url=storage_url, credential=DefaultAzureCredential())
+            file_client = service.get_file_system_client(container).get_file_client(path)
+            with open(file_path, 'rb') as f:
+                file_client.upload_data(f, overwrite=True)
+            
+            adls_url = f"{storage_url.rstrip('/')}/{file_path}"
+            logger.info("Uploaded %s to %s", file_path, adls_url)
+            return adls_url
             
         except Exception as e:
-            logger.error(f"Failed to load data: {e}")
+            logger.error("Failed to upload %s to ADLS: %s", file_path, e)
+            raise
+    
+    def truncate_synapse_table(self, synapse_config: dict, target_table: str):
+        """
+        Empty a Synapse table
+        Used when a full load finds no source rows, so the table does not keep
+        the rows of the previous full load
+        """
+        conn = None
+        try:
+            conn = self.connect_synapse(synapse_config['server'], synapse_config['database'])
+            conn.cursor().execute(f"TRUNCATE TABLE {target_table}")
+            conn.commit()
+            logger.info("Truncated Synapse table %s", target_table)
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error("Failed to truncate %s: %s", target_table, e)
+            raise
+        finally:
+            if conn:
+                conn.close()
+    
+    def load_to_synapse(self, synapse_config: dict, adls_path: str, target_table: str,
+                        truncate: bool = False, columns: Optional[List[str]] = None,
+                        lineage: Optional[Dict[str, str]] = None):
+        """
+        Bulk load a Parquet file from ADLS into Synapse with a single COPY INTO
+        Avoids row-by-row ODBC inserts; Synapse reads the file in parallel
+        With truncate (full loads) the table is emptied in the same transaction
+        so re-running a full load replaces rather than duplicates its rows
+        
+        COPY INTO does not read Parquet footer metadata, so the lineage values
+        (see ingestion_metadata) are written to the target's _source_system,
+        _ingestion_timestamp and _migration_batch_id columns by an UPDATE of
+        the just-copied rows in the same transaction. columns (the Bronze
+        file's columns) is then the COPY INTO column list, leaving the lineage
+        columns NULL until the UPDATE
+        """
+        conn = None
+        try:
+            conn = self.connect_synapse(synapse_config['server'], synapse_config['database'])
+            cursor = conn.cursor()
+            if truncate:
+                cursor.execute(f"TRUNCATE TABLE {target_table}")
+            column_list = f" ({', '.join(f'[{col}]' for col in columns)})" if columns else ''
+            cursor.execute(f"""
+            COPY INTO {target_table}{column_list}
+            FROM '{adls_path}'
+            WITH (
+                FILE_TYPE = 'PARQUET',
+                CREDENTIAL = (IDENTITY = 'Managed Identity')
+            )
+            """)
+            if lineage:
+                cursor.execute(f"""
+                UPDATE {target_table}
+                SET _source_system = ?, _ingestion_timestamp = ?, _migration_batch_id = ?
+                WHERE _migration_batch_id IS NULL
+                """, lineage['_source_system'], lineage['_ingestion_timestamp'], lineage['_migration_batch_id'])
+            conn.commit()
+            logger.info("Copied %s into Synapse table %s", adls_path, target_table)
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error("Failed to load %s into Synapse: %s", target_table, e)
             raise
+        finally:
+            if conn:
+                conn.close()
     
-    def migrate_table(self, source_config: dict, table_name: str, incremental: bool = True):
+    def migrate_table(self, source_config: dict, table_name: str, incremental: bool = True,
+                      synapse_config: Optional[dict] = None):
         """
         End-to-end migration for a single table
         1. Extract from SQL Server
         2. Transform
         3. Load to Bronze
-        4. Update watermark
+        4. Upload to ADLS and COPY INTO Synapse (when synapse_config maps the table)
+        5. Update watermark
         """
-        logger.info(f"Starting migration for {table_name}")
+        logger.info("Starting migration for %s", table_name)
         
         conn = None
+        writer = None
         try:
+            columns = source_config.get('columns', {}).get(table_name)
+            pk_column = source_config.get('primary_keys', {}).get(table_name)
+            
             # Connect to source
             conn = self.connect_onprem_sql(
                 source_config['server'],
                 source_config['database'],
                 source_config['username'],
-                source_config['password']
+                source_config['password'],
+                source_config.get('char_encoding')
             )
+            source_types = self.source_column_types(conn, table_name, columns)
             
-            # Extract
-            df = self.extract_data(conn, table_name, incremental)
+            if not incremental and cx is not None and source_config.get('use_connectorx'):
+                # Arrow-native full load; connectorx manages its own connections
+                batches = self.extract_data_connectorx(source_config, table_name, columns)
+            else:
+                batches = self.extract_data(conn, table_name, incremental, columns, pk_column)
             
-            if len(df) == 0:
-                logger.info(f"No new data for {table_name}")
-                return
+            # Extract, transform and load batch by batch
+            total_rows = 0
+            last_position = None
+            file_metadata = self.ingestion_metadata()
+            file_path = self.adls_path(table_name, 'bronze', file_metadata['_migration_batch_id'])
+            # Date columns are configured per table, so every batch and every run
+            # writes them with the same type
+            date_columns = [self.snake_case(c) for c in source_config.get('date_columns', {}).get(table_name, [])]
+            for df in batches:
+                if len(df) == 0:
+                    continue
+                
+                # Chunked selects are ordered by (LastModified, pk): the last row is the new position
+                if incremental and pk_column:
+                    last_position = (df['LastModified'].iloc[-1], df[pk_column].iloc[-1])
+                
+                # Transform
+                df_transformed = self.transform_for_synapse(df, date_columns)
+                
+                # Load to Bronze (file schema is fixed when the writer opens)
+                schema = None
+                if writer is None:
+                    schema = self.bronze_schema(df_transformed, source_types, date_columns)
+                writer = self.load_to_adls(df_transformed, file_path, writer, file_metadata, schema)
+                total_rows += len(df_transformed)
+                
+                # Without a key, track max LastModified across batches for the watermark
+                if incremental and not pk_column and 'lastmodified' in df_transformed.columns:
+                    batch_max = df_transformed['lastmodified'].max()
+                    if last_position is None or batch_max > last_position[0]:
+                        last_position = (batch_max, None)
             
-            # Transform
-            df_transformed = self.transform_for_synapse(df)
+            # Finalize the Parquet footer before advancing the watermark
+            bronze_columns = None
+            if writer is not None:
+                bronze_columns = writer.schema.names
+                writer.close()
+                writer = None
             
-            # Load to Bronze
-            file_path = self.load_to_adls(df_transformed, table_name, 'bronze')
+            target_table = (synapse_config or {}).get('tables', {}).get(table_name)
+            if synapse_config and not target_table:
+                logger.warning("No Synapse target table configured for %s; skipping COPY INTO", table_name)
             
-            # Update watermark (use max LastModified from source)
-            if incremental and 'lastmodified' in df.columns:
-                new_watermark = df['lastmodified'].max()
-                self.update_watermark(table_name, new_watermark)
+            if total_rows == 0:
+                logger.info("No new data for %s", table_name)
+                # An empty full load still replaces the table's contents
+                if target_table and not incremental:
+                    self.truncate_synapse_table(synapse_config, target_table)
+                return
+            
+            # Upload the Bronze file and bulk load it into its Synapse table
+            if target_table:
+                adls_url = self.upload_to_adls(synapse_config['storage_url'], file_path)
+                self.load_to_synapse(synapse_config, adls_url, target_table, truncate=not incremental,
+                                     columns=bronze_columns, lineage=file_metadata)
+            
+            # Update watermark (last LastModified/key migrated from source)
+            if last_position is not None:
+                self.update_watermark(table_name, *last_position)
             
-            logger.info(f"Migration completed for {table_name}: {len(df)} rows")
+            logger.info("Migration completed for %s: %d rows", table_name, total_rows)
             
         except Exception as e:
-            logger.error(f"Migration failed for {table_name}: {e}")
+            logger.error("Migration failed for %s: %s", table_name, e)
             raise
         finally:
+            if writer is not None:
+                writer.close()
             if conn:
                 conn.close()
 
@@ -194,19 +646,59 @@ if __name__ == "__main__":
         'server': 'onprem-sql-server.company.local',
         'database': 'LegacyDataWarehouse',
         'username': 'migration_user',
-        'password': 'secure_password'  # Use Key Vault in production!
+        'password': 'secure_password',  # Use Key Vault in production!
+        # Columns to extract per table; tables not listed fall back to SELECT *
+        # Incremental tables must include LastModified for the watermark
+        'columns': {
+            'dim_customer': ['CustomerID', 'CustomerName', 'Email', 'Phone', 'Address',
+                             'City', 'State', 'Country', 'PostalCode', 'LastModified'],
+        },
+        # Set to True to stream full loads through connectorx (if installed)
+        'use_connectorx': False,
+        # Text columns holding ISO-8601 dates, loaded as timestamps; any value
+        # that does not parse fails the load instead of becoming NULL
+        'date_columns': {},
+        # Key columns for chunked incremental extraction (keyset pagination)
+        'primary_keys': {
+            'fact_sales': 'SalesID',
+            'fact_inventory': 'InventoryID',
+        }
+    }
+    
+    synapse_config = {
+        'server': 'synapse-dataplatform-prod.sql.azuresynapse.net',
+        'database': 'sqlpoolprod',
+        'storage_url': 'https://sadataplatformprod001.dfs.core.windows.net',
+        # Source table -> Synapse staging table with the Bronze file's columns
+        # (not the gold.* star schema, which is built from staging)
+        'tables': {
+            'dim_customer': 'stg.dim_customer',
+            'dim_product': 'stg.dim_product',
+            'dim_date': 'stg.dim_date',
+            'fact_sales': 'stg.fact_sales',
+            'fact_inventory': 'stg.fact_inventory',
+        }
     }
     
     pipeline = CloudMigrationPipeline()
     
+    # Tables are independent and I/O-bound (ODBC fetch, Parquet write, COPY INTO),
+    # so migrate them concurrently; pyodbc and pyarrow release the GIL
+    
     # Migrate dimension tables (full load)
     dimensions = ['dim_customer', 'dim_product', 'dim_date']
-    for table in dimensions:
-        pipeline.migrate_table(source_config, table, incremental=False)
+    with ThreadPoolExecutor(max_workers=min(8, len(dimensions))) as ex:
+        list(ex.map(
+            lambda t: pipeline.migrate_table(source_config, t, incremental=False, synapse_config=synapse_config),
+            dimensions
+        ))
     
     # Migrate fact tables (incremental)
     facts = ['fact_sales', 'fact_inventory']
-    for table in facts:
-        pipeline.migrate_table(source_config, table, incremental=True)
+    with ThreadPoolExecutor(max_workers=min(8, len(facts))) as ex:
+        list(ex.map(
+            lambda t: pipeline.migrate_table(source_config, t, incremental=True, synapse_config=synapse_config),
+            facts
+        ))
     
     logger.info("Migration batch completed successfully!")
@@ -0,0 +1,25 @@
+"""
+Shared test setup
+pyodbc needs the native unixODBC library at import time; when it cannot be
+loaded, a stub module stands in. Tests never open real connections, they
+replace connect_onprem_sql / pd.read_sql with fakes
+"""
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import pyodbc  # noqa: F401
+except ImportError:
+    pyodbc_stub = types.ModuleType('pyodbc')
+    pyodbc_stub.SQL_CHAR = 1
+    pyodbc_stub.SQL_WCHAR = -8
+
+    def _connect(*args, **kwargs):
+        raise RuntimeError("pyodbc is stubbed in tests; patch the connection instead")
+
+    pyodbc_stub.connect = _connect
+    sys.modules['pyodbc'] = pyodbc_stub
@@ -0,0 +1,162 @@
+"""
+Tests for the migration data validation checks
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from data_validation import MigrationValidator  # noqa: E402
+
+
+class FakeCursor:
+    """Answers COUNT/CHECKSUM queries from a canned list of result rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, *params):
+        self.queries.append(query)
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+@pytest.fixture
+def validator():
+    return MigrationValidator()
+
+
+def test_checksum_integer_keys_match(validator):
+    source = pd.DataFrame({'id': [1, 2, 3], 'amount': [10.0, 20.0, 30.0]})
+    target = source.sample(frac=1, random_state=0).reset_index(drop=True)
+    assert validator.validate_checksum(source, target, 'id')
+
+
+def test_checksum_integer_keys_detects_changed_value(validator):
+    source = pd.DataFrame({'id': [1, 2, 3], 'amount': [10.0, 20.0, 30.0]})
+    target = pd.DataFrame({'id': [1, 2, 3], 'amount': [10.0, 25.0, 30.0]})
+    assert not validator.validate_checksum(source, target, 'id')
+
+
+def test_checksum_negative_integer_keys(validator):
+    source = pd.DataFrame({'id': [-3, -1, 0, 7], 'name': ['a', 'b', 'c', 'd']})
+    assert validator.validate_checksum(source, source.copy(), 'id')
+
+    target = pd.DataFrame({'id': [-3, -1, 0, 7], 'name': ['a', 'x', 'c', 'd']})
+    assert not validator.validate_checksum(source, target, 'id')
+
+
+def test_checksum_does_not_modify_inputs(validator):
+    source = pd.DataFrame({'id': [1, 2], 'amount': [1.0, 2.0]})
+    validator.validate_checksum(source, source.copy(), 'id')
+    assert list(source.columns) == ['id', 'amount']
+
+
+def test_checksum_string_keys(validator):
+    source = pd.DataFrame({'code': ['A-1', 'B-2', 'C-3'], 'qty': [1, 2, 3]})
+    assert validator.validate_checksum(source, source.iloc[::-1].reset_index(drop=True), 'code')
+
+    target = pd.DataFrame({'code': ['A-1', 'B-2', 'D-4'], 'qty': [1, 2, 3]})
+    assert not validator.validate_checksum(source, target, 'code')
+
+
+def test_run_all_fail_fast_reports_skipped_checks(validator):
+    source = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']})
+    target = source.iloc[:2]
+
+    results = validator.run_all(source, target, 'id', ['name'], fail_fast=True)
+
+    assert results['row_count'] is False
+    assert 'schema' not in results and 'nulls' not in results and 'checksum' not in results
+
+    report = validator.generate_validation_report('dim_customer', results)
+    assert report.count('SKIPPED') == 3
+    assert 'ISSUES DETECTED' in report
+
+
+def test_run_all_without_fail_fast_runs_every_check(validator):
+    source = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+
+    results = validator.run_all(source, source.copy(), 'id', ['name'])
+
+    assert all(results[check] for check in ['row_count', 'schema', 'nulls', 'checksum'])
+    assert 'APPROVED FOR PRODUCTION' in validator.generate_validation_report('dim_customer', results)
+
+
+def test_validate_nulls_nullable_integer_column(validator):
+    df = pd.DataFrame({
+        'id': pd.array([1, 2, 3], dtype='Int64'),
+        'parent_id': pd.array([1, None, 3], dtype='Int64'),
+    })
+    assert validator.validate_nulls(df, ['id'])
+    assert not validator.validate_nulls(df, ['id', 'parent_id'])
+
+
+def test_validate_nulls_float_and_object_columns(validator):
+    df = pd.DataFrame({'amount': [1.0, float('nan')], 'name': ['a', None]})
+    assert not validator.validate_nulls(df, ['amount'])
+    assert not validator.validate_nulls(df, ['name'])
+
+
+def test_row_counts_bulk(validator):
+    src_conn = FakeConnection([('dim_customer', 10), ('fact_sales', 500)])
+    tgt_conn = FakeConnection([('dim_customer', 10), ('fact_sales', 499)])
+
+    results = validator.validate_row_counts_bulk(
+        src_conn, tgt_conn, ['dim_customer', 'fact_sales'],
+        target_tables={'fact_sales': 'stg.fact_sales'}
+    )
+
+    assert results == {'dim_customer': (10, 10, True), 'fact_sales': (500, 499, False)}
+    assert len(src_conn.cursor_obj.queries) == 1 and len(tgt_conn.cursor_obj.queries) == 1
+    assert 'FROM stg.fact_sales' in tgt_conn.cursor_obj.queries[0]
+    assert 'FROM stg.fact_sales' not in src_conn.cursor_obj.queries[0]
+
+
+def test_row_counts_bulk_empty_table_list(validator):
+    src_conn, tgt_conn = FakeConnection([]), FakeConnection([])
+    assert validator.validate_row_counts_bulk(src_conn, tgt_conn, []) == {}
+    assert src_conn.cursor_obj.queries == [] and tgt_conn.cursor_obj.queries == []
+
+
+def test_checksum_sql_casts_both_sides_to_common_types(validator):
+    src_conn = FakeConnection([(3, 12345)])
+    tgt_conn = FakeConnection([(3, 12345)])
+
+    assert validator.validate_checksum_sql(
+        src_conn, tgt_conn, 'dbo.FactSales',
+        value_columns={'SalesID': 'BIGINT', 'UnitPrice': 'DECIMAL(18,2)'},
+        target_table='stg.fact_sales',
+        target_columns={'SalesID': 'salesid', 'UnitPrice': 'unitprice'}
+    )
+    assert ("BINARY_CHECKSUM(CAST([SalesID] AS BIGINT), CAST([UnitPrice] AS DECIMAL(18,2)))"
+            in src_conn.cursor_obj.queries[0])
+    assert ("BINARY_CHECKSUM(CAST([salesid] AS BIGINT), CAST([unitprice] AS DECIMAL(18,2)))"
+            in tgt_conn.cursor_obj.queries[0])
+    assert 'FROM stg.fact_sales' in tgt_conn.cursor_obj.queries[0]
+
+
+def test_checksum_sql_detects_mismatch(validator):
+    assert not validator.validate_checksum_sql(
+        FakeConnection([(3, 12345)]), FakeConnection([(3, 54321)]), 'fact_sales',
+        value_columns={'SalesID': 'BIGINT'}
+    )
+
+
+def test_checksum_sql_requires_value_columns(validator):
+    with pytest.raises(ValueError):
+        validator.validate_checksum_sql(FakeConnection([]), FakeConnection([]), 'fact_sales', {})
@@ -0,0 +1,300 @@
+"""
+Tests for the migration pipeline
+The source database is replaced by an in-memory DataFrame behind pd.read_sql
+"""
+
+import re
+from datetime import datetime
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("azure.storage.filedatalake")
+
+import migration_pipeline  # noqa: E402
+from migration_pipeline import CloudMigrationPipeline  # noqa: E402
+
+
+class FakeCursor:
+    """Reports result-set metadata for the SELECT TOP 0 schema query"""
+
+    def __init__(self, source: pd.DataFrame):
+        self.description = [
+            (name, self._python_type(dtype), None, None, None, None, True)
+            for name, dtype in source.dtypes.items()
+        ]
+
+    @staticmethod
+    def _python_type(dtype):
+        if pd.api.types.is_integer_dtype(dtype):
+            return int
+        if pd.api.types.is_float_dtype(dtype):
+            return float
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return datetime
+        return str
+
+    def execute(self, query, *params):
+        return self
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Stands in for a pyodbc connection; data queries are answered by a fake pd.read_sql"""
+
+    def __init__(self, source: pd.DataFrame):
+        self.source = source
+
+    def cursor(self):
+        return FakeCursor(self.source)
+
+    def close(self):
+        pass
+
+
+def make_fake_read_sql(source: pd.DataFrame, pk_column: str):
+    """Answer the keyset-paginated SELECT TOP queries issued by extract_data"""
+    def fake_read_sql(query, conn, params=None, chunksize=None):
+        top = int(re.search(r'TOP (\d+)', query).group(1))
+        last_ts, _, last_pk = params
+        # LastModified >= ? AND (LastModified > ? OR pk > ?); pk > NULL is never true
+        after = source['LastModified'] > pd.Timestamp(last_ts)
+        if last_pk is not None:
+            after |= source[pk_column] > last_pk
+        after &= source['LastModified'] >= pd.Timestamp(last_ts)
+        rows = source[after].sort_values(['LastModified', pk_column]).head(top)
+        # Fresh object per call, like a real driver fetch
+        return rows.reset_index(drop=True).copy()
+    return fake_read_sql
+
+
+def test_chunked_incremental_load_spans_multiple_full_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = pd.DataFrame({
+        'SalesID': [1, 2, 3, 4, 5],
+        'Amount': [10.0, 20.0, 30.0, 40.0, 50.0],
+        # Ties on LastModified must be resolved by the key
+        'LastModified': pd.to_datetime([
+            '2024-01-01', '2024-01-01', '2024-01-02', '2024-01-02', '2024-01-03'
+        ]),
+    })
+    monkeypatch.setattr(migration_pipeline.pd, 'read_sql', make_fake_read_sql(source, 'SalesID'))
+
+    pipeline = CloudMigrationPipeline()
+    pipeline.batch_size = 2  # chunks of 2, 2, 1
+    monkeypatch.setattr(pipeline, 'connect_onprem_sql', lambda *args, **kwargs: FakeConnection(source))
+
+    source_config = {
+        'server': 'test', 'database': 'test', 'username': 'test', 'password': 'test',
+        'primary_keys': {'fact_sales': 'SalesID'},
+    }
+    pipeline.migrate_table(source_config, 'fact_sales', incremental=True)
+
+    written = pq.read_table(next(tmp_path.glob('bronze/fact_sales/*/*/*/*.parquet'))).to_pandas()
+    assert written['salesid'].tolist() == [1, 2, 3, 4, 5]
+
+    watermark = pipeline.get_watermark('fact_sales')
+    assert watermark['last_ts'] == datetime(2024, 1, 3)
+    assert watermark['last_pk'] == 5
+
+
+def test_chunked_load_that_makes_no_progress_raises(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = pd.DataFrame({
+        'SalesID': [1, 2, 3],
+        'LastModified': pd.to_datetime(['2024-01-01'] * 3),
+    })
+
+    # A driver whose timestamp comparison never matches the tie returns the first chunk again
+    def stuck_read_sql(query, conn, params=None, chunksize=None):
+        return source.head(2).copy()
+
+    monkeypatch.setattr(migration_pipeline.pd, 'read_sql', stuck_read_sql)
+
+    pipeline = CloudMigrationPipeline()
+    pipeline.batch_size = 2
+    chunks = pipeline.extract_data(FakeConnection(source), 'fact_sales', True, pk_column='SalesID')
+    with pytest.raises(RuntimeError, match="no progress"):
+        for _ in range(3):
+            next(chunks)
+
+
+def test_legacy_text_watermarks_are_imported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "migration_watermark.txt").write_text(
+        "fact_sales=2024-01-01T00:00:00\n"
+        "fact_inventory=2024-02-01T00:00:00\n"
+        "fact_sales=2024-03-01T12:30:00\n"
+    )
+
+    pipeline = CloudMigrationPipeline()
+
+    assert pipeline.get_watermark('fact_sales')['last_ts'] == datetime(2024, 3, 1, 12, 30)
+    assert pipeline.get_watermark('fact_sales')['last_pk'] is None
+    assert pipeline.get_watermark('fact_inventory')['last_ts'] == datetime(2024, 2, 1)
+    assert pipeline.get_watermark('dim_customer')['last_ts'] == datetime(1900, 1, 1)
+
+
+def make_order_source() -> pd.DataFrame:
+    source = pd.DataFrame({
+        'OrderID': [1, 2, 3, 4],
+        # All NULL in the first batch, text in the second
+        'Notes': [None, None, 'gift', 'rush'],
+        # Looks like a date in the first batch, has a placeholder in the second
+        'ShipDate': ['2024-01-01', '2024-01-02', 'n/a', '2024-01-04'],
+        'OrderDate': ['2024-01-01', '2024-01-01', '2024-01-02', None],
+    })
+    return source.astype({'Notes': object, 'ShipDate': object, 'OrderDate': object})
+
+
+def run_full_load(monkeypatch, source: pd.DataFrame, source_config: dict) -> CloudMigrationPipeline:
+    """Full load of dim_order, served to the pipeline in two batches"""
+    def fake_read_sql(query, conn, params=None, chunksize=None):
+        return iter([source.iloc[:2].copy(), source.iloc[2:].reset_index(drop=True).copy()])
+
+    monkeypatch.setattr(migration_pipeline.pd, 'read_sql', fake_read_sql)
+
+    pipeline = CloudMigrationPipeline()
+    monkeypatch.setattr(pipeline, 'connect_onprem_sql', lambda *args, **kwargs: FakeConnection(source))
+    pipeline.migrate_table(
+        {'server': 'test', 'database': 'test', 'username': 'test', 'password': 'test', **source_config},
+        'dim_order', incremental=False
+    )
+    return pipeline
+
+
+def test_watermark_updates_from_separate_processes_are_merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Both pipelines load the (missing) watermark file before either writes
+    first, second = CloudMigrationPipeline(), CloudMigrationPipeline()
+
+    first.update_watermark('fact_sales', datetime(2024, 1, 1), 10)
+    second.update_watermark('fact_inventory', datetime(2024, 2, 1), 20)
+
+    merged = CloudMigrationPipeline()
+    assert merged.get_watermark('fact_sales')['last_pk'] == 10
+    assert merged.get_watermark('fact_inventory')['last_pk'] == 20
+
+
+def test_failed_watermark_write_raises_and_keeps_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipeline = CloudMigrationPipeline()
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(migration_pipeline.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        pipeline.update_watermark('fact_sales', datetime(2024, 1, 1), 10)
+
+    assert pipeline.get_watermark('fact_sales')['last_ts'] == datetime(1900, 1, 1)
+
+
+def test_full_load_keeps_one_schema_across_batches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    run_full_load(monkeypatch, make_order_source(), {'date_columns': {'dim_order': ['OrderDate']}})
+
+    written = pq.read_table(next(tmp_path.glob('bronze/dim_order/*/*/*/*.parquet')))
+    assert written.schema.field('notes').type == migration_pipeline.pa.string()
+    assert written.column('notes').to_pylist() == [None, None, 'gift', 'rush']
+    # Not configured as a date column: kept as text, nothing dropped
+    assert written.schema.field('shipdate').type == migration_pipeline.pa.string()
+    assert written.column('shipdate').to_pylist() == ['2024-01-01', '2024-01-02', 'n/a', '2024-01-04']
+    assert written.schema.field('orderdate').type == migration_pipeline.pa.timestamp('us')
+    assert written.column('orderdate').null_count == 1
+
+
+def test_unparseable_configured_date_fails_the_load(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="shipdate"):
+        run_full_load(monkeypatch, make_order_source(), {'date_columns': {'dim_order': ['ShipDate']}})
+
+
+def test_empty_full_load_truncates_synapse_table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = make_order_source().iloc[:0]
+    truncated = []
+
+    def fake_read_sql(query, conn, params=None, chunksize=None):
+        return iter([source.copy()])
+
+    monkeypatch.setattr(migration_pipeline.pd, 'read_sql', fake_read_sql)
+
+    pipeline = CloudMigrationPipeline()
+    monkeypatch.setattr(pipeline, 'connect_onprem_sql', lambda *args, **kwargs: FakeConnection(source))
+    monkeypatch.setattr(pipeline, 'truncate_synapse_table', lambda config, table: truncated.append(table))
+
+    source_config = {'server': 'test', 'database': 'test', 'username': 'test', 'password': 'test'}
+    synapse_config = {'server': 'test', 'database': 'test', 'storage_url': 'https://test',
+                      'tables': {'dim_order': 'stg.dim_order'}}
+    pipeline.migrate_table(source_config, 'dim_order', incremental=False, synapse_config=synapse_config)
+
+    assert truncated == ['stg.dim_order']
+
+
+def test_bronze_file_name_includes_batch_id(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipeline = CloudMigrationPipeline()
+
+    first = pipeline.adls_path('fact_sales', 'bronze', '20240101010101')
+    second = pipeline.adls_path('fact_sales', 'bronze', '20240101020202')
+
+    assert first != second
+    assert first.endswith('/fact_sales_20240101010101.parquet')
+
+
+class RecordingConnection:
+    """Synapse connection stand-in that records every statement and its parameters"""
+
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, *params):
+        self.statements.append((' '.join(query.split()), params))
+        return self
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_synapse_load_writes_lineage_columns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = pd.DataFrame({'OrderID': [1, 2], 'Notes': ['gift', 'rush']})
+
+    def fake_read_sql(query, conn, params=None, chunksize=None):
+        return iter([source.copy()])
+
+    monkeypatch.setattr(migration_pipeline.pd, 'read_sql', fake_read_sql)
+
+    synapse = RecordingConnection()
+    pipeline = CloudMigrationPipeline()
+    monkeypatch.setattr(pipeline, 'connect_onprem_sql', lambda *args, **kwargs: FakeConnection(source))
+    monkeypatch.setattr(pipeline, 'connect_synapse', lambda *args: synapse)
+    monkeypatch.setattr(pipeline, 'upload_to_adls', lambda url, path: f"{url}/{path}")
+
+    source_config = {'server': 'test', 'database': 'test', 'username': 'test', 'password': 'test'}
+    synapse_config = {'server': 'test', 'database': 'test', 'storage_url': 'https://test',
+                      'tables': {'dim_order': 'stg.dim_order'}}
+    pipeline.migrate_table(source_config, 'dim_order', incremental=False, synapse_config=synapse_config)
+
+    truncate, copy, update = synapse.statements
+    assert truncate[0] == "TRUNCATE TABLE stg.dim_order"
+    assert copy[0].startswith("COPY INTO stg.dim_order ([orderid], [notes]) FROM 'https://test/bronze/dim_order/")
+    assert update[0].startswith("UPDATE stg.dim_order SET _source_system = ?")
+    source_system, ingested_at, batch_id = update[1]
+    assert source_system == 'legacy_sql_server'
+    assert copy[0].count(batch_id) == 1
+    assert synapse.committed